@@ -1,8 +1,233 @@
-import json
+import codecs
+import io
 import os
-import xml.etree.ElementTree as ET
-from typing import Optional
-from xml.dom import minidom
+import stat
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, partial
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, Iterator, Mapping, NamedTuple, Optional, Tuple
+from xml.sax.saxutils import escape
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+_ATTR_ENTITIES = {'"': '&quot;'}
+_CHUNK_SIZE = 64 * 1024
+_READ_BUFFER_SIZE = 1 << 20
+_SMALL_FILE_SIZE = 1 << 20
+_MAX_SCAN_WORKERS = 8
+_SUFFIX_TRIE_THRESHOLD = 32
+
+
+class CompiledPatterns(NamedTuple):
+    """
+    Compiled exclusion patterns: folder names as sets, file patterns split into
+    exact names and '*' suffixes. Suffixes also get a reverse trie once there are
+    more than _SUFFIX_TRIE_THRESHOLD of them; below that str.endswith is faster.
+    """
+    full_folders: FrozenSet[str]
+    content_folders: FrozenSet[str]
+    full_exact_files: FrozenSet[str]
+    full_suffixes: Tuple[str, ...]
+    full_suffix_trie: Optional[dict]
+    content_exact_files: FrozenSet[str]
+    content_suffixes: Tuple[str, ...]
+    content_suffix_trie: Optional[dict]
+
+
+_PATTERN_CACHE: Dict[tuple, CompiledPatterns] = {}
+_PATTERN_CACHE_SIZE = 32
+
+
+def clear_pattern_cache() -> None:
+    """Drop all memoized compiled exclusion patterns."""
+    _PATTERN_CACHE.clear()
+
+
+def _get_compiled_patterns(full_excludes: dict, content_excludes: dict) -> CompiledPatterns:
+    """
+    Compile full and content exclusion patterns, reusing earlier results for
+    the same pattern lists. The oldest entry is evicted once the cache is full.
+    """
+    key = (tuple(sorted(full_excludes["folders"])), tuple(sorted(content_excludes["folders"])),
+           tuple(sorted(full_excludes["files"])), tuple(sorted(content_excludes["files"])))
+    patterns = _PATTERN_CACHE.get(key)
+    if patterns is None:
+        def split_patterns(pattern_list: tuple) -> tuple:
+            exact = frozenset(p for p in pattern_list if not p.startswith('*'))
+            suffixes = tuple(p[1:] for p in pattern_list if p.startswith('*'))
+            trie = _build_suffix_trie(suffixes) if len(suffixes) > _SUFFIX_TRIE_THRESHOLD else None
+            return exact, suffixes, trie
+
+        patterns = CompiledPatterns(frozenset(key[0]), frozenset(key[1]),
+                                    *split_patterns(key[2]), *split_patterns(key[3]))
+        if len(_PATTERN_CACHE) >= _PATTERN_CACHE_SIZE:
+            del _PATTERN_CACHE[next(iter(_PATTERN_CACHE))]
+        _PATTERN_CACHE[key] = patterns
+    return patterns
+
+
+def _scan_dir(path: str) -> list:
+    """List a directory's entries sorted by name; unreadable directories are empty."""
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except PermissionError:
+        return []
+    entries.sort(key=attrgetter('name'))
+    return entries
+
+
+def _read_chunks(path: str) -> Iterator[bytes]:
+    """
+    Yield the bytes of a file until EOF. Files up to _SMALL_FILE_SIZE start with a
+    single os.read of their fstat size, skipping the buffered io stack whose setup
+    dominates for the many small files of a typical project; reading continues until
+    os.read returns b'' in case the file grew or its size under-reports (procfs, FUSE).
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        size = os.fstat(fd).st_size
+        if size > _SMALL_FILE_SIZE:
+            src = open(fd, 'rb', buffering=_READ_BUFFER_SIZE)
+            fd = None  # Now owned and closed by src
+            with src:
+                yield from iter(partial(src.read, _CHUNK_SIZE), b'')
+            return
+
+        chunk = os.read(fd, size or _CHUNK_SIZE)
+        while chunk:
+            yield chunk
+            chunk = os.read(fd, _CHUNK_SIZE)
+    finally:
+        if fd is not None:
+            os.close(fd)
+
+
+def _escape_attr(value: str) -> str:
+    """Escape a string for use in a double-quoted XML attribute."""
+    return escape(value, _ATTR_ENTITIES)
+
+
+@lru_cache(maxsize=4096)
+def _escape_name(name: str) -> str:
+    """Escape a file or directory name for an XML attribute, caching names like '__init__.py' that repeat."""
+    return _escape_attr(name)
+
+
+def _build_suffix_trie(suffixes: Iterable[str]) -> dict:
+    """
+    Build a trie over the reversed suffixes. Nodes are dicts keyed by character;
+    a None key marks the end of a suffix.
+    """
+    trie = {}
+    for suffix in suffixes:
+        node = trie
+        for char in reversed(suffix):
+            node = node.setdefault(char, {})
+        node[None] = True
+    return trie
+
+
+def _matches_suffix(trie: dict, name: str) -> bool:
+    """Check if name ends with any suffix in a trie built by _build_suffix_trie."""
+    node = trie
+    if None in node:
+        return True
+    for char in reversed(name):
+        node = node.get(char)
+        if node is None:
+            return False
+        if None in node:
+            return True
+    return False
+
+
+def _freeze(value):
+    """Return a read-only copy of a JSON-like value: dicts become mapping proxies and lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    """Return a mutable deep copy of a value made by _freeze."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+DEFAULT_CONFIG = _freeze({
+    "full_excludes": {
+        "folders": [
+            ".git",
+            "node_modules",
+            "__pycache__",
+            ".venv",
+            "venv",
+            "env",
+            ".idea",
+            ".vscode",
+            "dist",
+            "build",
+            "eggs",
+            ".eggs",
+            ".pytest_cache",
+            ".mypy_cache",
+            ".coverage",
+            ".tox"
+        ],
+        "files": [
+            ".DS_Store",
+            "*.pyc",
+            "*.pyo",
+            "*.pyd",
+            "*.so",
+            "*.dylib",
+            "*.dll",
+            ".gitignore",
+            ".coverage",
+            ".python-version"
+        ]
+    },
+    "content_excludes": {
+        "folders": [
+            "migrations",
+            "static",
+            "media"
+        ],
+        "files": [
+            "__init__.py",
+            "*.log",
+            "*.pkl",
+            "*.pdf",
+            "*.jpg",
+            "*.png",
+            "*.svg",
+            "*.sqlite3",
+            "*.db",
+            "*.csv",
+            "*.json",
+            "*.xml",
+            "*.yaml",
+            "*.yml",
+            "*.env",
+            "*.lock",
+            "requirements.txt"
+        ]
+    },
+    "follow_symlinks": False,
+    "default_output_name": "project_structure.xml",
+    "project_overview": "Python project structure analysis"
+})
 
 
 class ProjectAnalyzer:
@@ -17,126 +242,72 @@ class ProjectAnalyzer:
                         in the working directory and uses default configuration if not found.
         """
         self.config = None
-        self.default_config = {
-            "full_excludes": {
-                "folders": [
-                    ".git",
-                    "node_modules",
-                    "__pycache__",
-                    ".venv",
-                    "venv",
-                    "env",
-                    ".idea",
-                    ".vscode",
-                    "dist",
-                    "build",
-                    "eggs",
-                    ".eggs",
-                    ".pytest_cache",
-                    ".mypy_cache",
-                    ".coverage",
-                    ".tox"
-                ],
-                "files": [
-                    ".DS_Store",
-                    "*.pyc",
-                    "*.pyo",
-                    "*.pyd",
-                    "*.so",
-                    "*.dylib",
-                    "*.dll",
-                    ".gitignore",
-                    ".coverage",
-                    ".python-version"
-                ]
-            },
-            "content_excludes": {
-                "folders": [
-                    "migrations",
-                    "static",
-                    "media"
-                ],
-                "files": [
-                    "__init__.py",
-                    "*.log",
-                    "*.pkl",
-                    "*.pdf",
-                    "*.jpg",
-                    "*.png",
-                    "*.svg",
-                    "*.sqlite3",
-                    "*.db",
-                    "*.csv",
-                    "*.json",
-                    "*.xml",
-                    "*.yaml",
-                    "*.yml",
-                    "*.env",
-                    "*.lock",
-                    "requirements.txt"
-                ]
-            },
-            "default_output_name": "project_structure.xml",
-            "project_overview": "Python project structure analysis"
-        }
 
         # Initialize with provided config or search for default config file
         self.load_config(config_path)
 
+    @property
+    def default_config(self) -> Mapping:
+        """The built-in default configuration, as a read-only view of DEFAULT_CONFIG."""
+        return DEFAULT_CONFIG
+
     def load_config(self, config_path: Optional[str] = None) -> None:
         """
         Load configuration from file or use defaults.
         Searches for 'analyzer_config.json' in the current directory if no path provided.
         """
-        config = self.default_config.copy()
+        config = _thaw(DEFAULT_CONFIG)
 
         def try_load_config(path: str) -> bool:
             """Try to load config from a specific path."""
-            if os.path.exists(path):
-                try:
-                    with open(path, 'r') as f:
-                        user_config = json.load(f)
-                        config.update(user_config)
-                        print(f"Loaded configuration from: {path}")
-                        return True
-                except Exception as e:
-                    print(f"Warning: Error loading config file {path}: {e}")
-            return False
+            try:
+                with open(path, 'rb') as f:
+                    config.update(_json_loads(f.read()))
+            except FileNotFoundError:
+                return False
+            except Exception as e:
+                print(f"Warning: Error loading config file {path}: {e}")
+                return False
 
-        # First try the explicitly provided config path
-        if config_path and try_load_config(config_path):
-            self.config = config
-            return
+            print(f"Loaded configuration from: {path}")
+            return True
 
-        # Then look for analyzer_config.json in current directory
-        if try_load_config('analyzer_config.json'):
-            self.config = config
-            return
+        # First try the explicitly provided config path,
+        # then look for analyzer_config.json in current directory
+        if not (config_path and try_load_config(config_path)) and not try_load_config('analyzer_config.json'):
+            # Use default config if no file found
+            print("Using default configuration")
 
-        # Use default config if no file found
-        print("Using default configuration")
         self.config = config
+        self._compile_patterns()
 
     def update_config_for_project(self, project_path: str) -> None:
         """
         Update configuration by looking for analyzer_config.json in the project directory.
         """
         config_path = os.path.join(project_path, 'analyzer_config.json')
-        if os.path.exists(config_path):
-            try:
-                with open(config_path, 'r') as f:
-                    project_config = json.load(f)
-                    self.config.update(project_config)
-                    print(f"Updated configuration from project: {config_path}")
-            except Exception as e:
-                print(f"Warning: Error loading project config file: {e}")
+        try:
+            with open(config_path, 'rb') as f:
+                self.config.update(_json_loads(f.read()))
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"Warning: Error loading project config file: {e}")
+            return
+
+        print(f"Updated configuration from project: {config_path}")
+
+    def _compile_patterns(self) -> None:
+        """Look up the compiled exclusion patterns for the current configuration."""
+        self._patterns = _get_compiled_patterns(self.config["full_excludes"], self.config["content_excludes"])
 
-    def should_exclude(self, path: str, content_only: bool = False) -> bool:
+    def should_exclude(self, name: str, is_dir: bool, content_only: bool = False) -> bool:
         """
-        Check if the path should be excluded based on configured patterns.
+        Check if a directory entry should be excluded based on configured patterns.
 
         Args:
-            path: Path to check for exclusion
+            name: Base name of the entry to check for exclusion
+            is_dir: Whether the entry is a directory
             content_only: If True, checks both full_excludes and content_excludes (for content parsing).
                          If False, checks only full_excludes (for structure display).
 
@@ -145,42 +316,38 @@ class ProjectAnalyzer:
                          - When checking content (content_only=True): both fully excluded and content-excluded items are hidden
 
         Returns:
-            bool: True if path should be excluded, False otherwise
+            bool: True if the entry should be excluded, False otherwise
         """
-        name = os.path.basename(path)
-
-        def matches_patterns(filename: str, patterns: list) -> bool:
-            for pattern in patterns:
-                if pattern.startswith('*'):
-                    if filename.endswith(pattern[1:]):
-                        return True
-                elif filename == pattern:
-                    return True
-            return False
-
-        if os.path.isdir(path):
+        patterns = self._patterns
+        if is_dir:
             if content_only:
                 # When checking content, exclude both full and content excludes
-                return (name in self.config["full_excludes"]["folders"] or
-                        name in self.config["content_excludes"]["folders"])
+                return name in patterns.full_folders or name in patterns.content_folders
             else:
                 # When checking structure, only exclude full excludes
-                return name in self.config["full_excludes"]["folders"]
+                return name in patterns.full_folders
         else:
-            if content_only:
+            # str.endswith(tuple) is checked inline, as a helper call would cost more than the match
+            excluded = (name in patterns.full_exact_files or
+                        (name.endswith(patterns.full_suffixes) if patterns.full_suffix_trie is None
+                         else _matches_suffix(patterns.full_suffix_trie, name)))
+            if content_only and not excluded:
                 # When checking content, exclude both full and content excludes
-                return (matches_patterns(name, self.config["full_excludes"]["files"]) or
-                        matches_patterns(name, self.config["content_excludes"]["files"]))
-            else:
-                # When checking structure, only exclude full excludes
-                return matches_patterns(name, self.config["full_excludes"]["files"])
-    def create_project_xml(self, folder_path: str, output_file: Optional[str] = None) -> str:
+                excluded = (name in patterns.content_exact_files or
+                            (name.endswith(patterns.content_suffixes) if patterns.content_suffix_trie is None
+                             else _matches_suffix(patterns.content_suffix_trie, name)))
+            return excluded
+
+    def create_project_xml(self, folder_path: str, output_file: Optional[str] = None,
+                           pretty: bool = False) -> str:
         """
         Generate XML structure for the project.
 
         Args:
             folder_path: Path to the project folder to analyze
             output_file: Optional output file path. If None, uses default name.
+            pretty: If True, indents the XML with newlines and two spaces per level.
+                    If False, writes compact XML without whitespace between tags.
 
         Returns:
             str: Path to the generated XML file
@@ -190,99 +357,193 @@ class ProjectAnalyzer:
         # Look for project-specific config
         self.update_config_for_project(folder_path)
 
+        # Pick up any edits made to self.config since it was loaded; unchanged
+        # patterns are served from the compiled pattern cache
+        self._compile_patterns()
+
         if output_file is None:
             output_file = os.path.join(folder_path, self.config["default_output_name"])
 
-        def process_directory_structure(path: str, parent_element: ET.Element) -> None:
+        # Write to a temporary file next to the output and move it into place when done, so
+        # a failed run never leaves a partial file. Both paths are skipped by the walk in case
+        # the output lies inside the project.
+        output_path = os.path.abspath(output_file)
+        output_dir, output_name = os.path.split(output_path)
+        temp_path = os.path.join(output_dir, f'.{output_name}.{uuid.uuid4().hex}.tmp')
+        skip_paths = frozenset((output_path, temp_path))
+        try:
+            with open(temp_path, 'x', encoding='utf-8') as f:
+                f.writelines(self._generate_xml(folder_path, pretty, skip_paths))
             try:
-                items = sorted(os.listdir(path))
-            except PermissionError:
-                return
-
-            for item in items:
-                full_path = os.path.join(path, item)
-                if self.should_exclude(full_path,content_only=False):
-                    continue
-
-                if os.path.isdir(full_path):
-                    dir_element = ET.SubElement(parent_element, 'dir')
-                    dir_element.set('name', item)
-                    process_directory_structure(full_path, dir_element)
-                else:
-                    file_element = ET.SubElement(parent_element, 'file')
-                    file_element.set('name', item)
-                    file_element.set('path', os.path.relpath(full_path, folder_path))
-
-        def process_files_content(path: str, parent_element: ET.Element) -> None:
+                # Keep the permissions of a file being overwritten
+                os.chmod(temp_path, stat.S_IMODE(os.stat(output_path).st_mode))
+            except FileNotFoundError:
+                pass
+            os.replace(temp_path, output_path)
+        except BaseException:
             try:
-                items = sorted(os.listdir(path))
-            except PermissionError:
-                return
-
-            for item in items:
-                full_path = os.path.join(path, item)
-                if self.should_exclude(full_path, content_only=True):
-                    continue
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
 
-                if os.path.isfile(full_path):
-                    file_element = ET.SubElement(parent_element, 'file')
-                    file_element.set('name', item)
-                    file_element.set('path', os.path.relpath(full_path, folder_path))
+        return output_file
 
-                    content_element = ET.SubElement(file_element, 'content')
-                    content_element.text = ''
+    def _generate_xml(self, folder_path: str, pretty: bool, skip_paths: FrozenSet[str]) -> Iterator[str]:
+        """
+        Yield the XML document for a project as text fragments.
 
-                elif os.path.isdir(full_path):
-                    process_files_content(full_path, parent_element)
+        The structure is written while the tree is walked; files whose content is
+        included are collected along the way and streamed into <contents> afterwards.
+        """
+        newline, indent = ('\n', '  ') if pretty else ('', '')
 
-        # Create root element
-        root = ET.Element('project')
-        root.set('path', folder_path)
+        yield f'<?xml version="1.0" ?>{newline}'
+        yield f'<project path="{_escape_attr(folder_path)}">{newline}'
 
         # Add project overview
-        overview = ET.SubElement(root, 'overview')
-        overview.text = self.config["project_overview"].strip()
+        overview = self.config["project_overview"].strip()
+        if overview:
+            yield f'{indent}<overview>{escape(overview)}</overview>{newline}'
+        else:
+            yield f'{indent}<overview/>{newline}'
 
-        # Add clean project structure
-        structure = ET.SubElement(root, 'structure')
-        process_directory_structure(folder_path, structure)
+        # Add clean project structure, collecting (name, path, full path) of content files
+        content_files = []
+        yield from self._generate_structure(folder_path, content_files, pretty, skip_paths)
 
         # Add file contents
-        contents = ET.SubElement(root, 'contents')
-        process_files_content(folder_path, contents)
-
-        # Convert to string and parse with minidom
-        xml_str = ET.tostring(root, encoding='unicode')
-        dom = minidom.parseString(xml_str)
-
-        # Add CDATA sections for file contents
-        for content_elem in dom.getElementsByTagName('content'):
-            while content_elem.firstChild:
-                content_elem.removeChild(content_elem.firstChild)
-
-            if content_elem.parentNode.hasAttribute('path'):
-                file_path = content_elem.parentNode.getAttribute('path')
-                full_path = os.path.join(folder_path, file_path)
-                try:
-                    with open(full_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        if ']]>' in content:
-                            print(f"Warning: Found ']]>' in file: {full_path}")
-                            # Either replace the sequence or handle it another way
-                            content = content.replace(']]>', ']]]]><![CDATA[>')
-                        cdata = dom.createCDATASection(content)
-                        content_elem.appendChild(cdata)
-                except Exception as e:
-                    print(f"Error processing file: {full_path}")
-                    print(f"Error details: {str(e)}")
-                    cdata = dom.createCDATASection(f"Error reading file: {str(e)}")
-                    content_elem.appendChild(cdata)
-
-        # Create pretty XML string
-        xml_str = dom.toprettyxml(indent="  ")
-
-        # Write to file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(xml_str)
-
-        return output_file
\ No newline at end of file
+        if not content_files:
+            yield f'{indent}<contents/>{newline}'
+        else:
+            yield f'{indent}<contents>{newline}'
+            for name, path, full_path in content_files:
+                yield (f'{indent * 2}<file name="{name}" path="{path}">{newline}'
+                       f'{indent * 3}<content><![CDATA[')
+                yield from self._generate_content(full_path)
+                yield f']]></content>{newline}{indent * 2}</file>{newline}'
+            yield f'{indent}</contents>{newline}'
+
+        yield f'</project>{newline}'
+
+    def _generate_structure(self, folder_path: str, content_files: list, pretty: bool,
+                            skip_paths: FrozenSet[str]) -> Iterator[str]:
+        """
+        Walk the project depth-first, yielding the <structure> element and appending
+        the escaped name, escaped relative path and full path of every file whose
+        content should be included to content_files. Entries whose absolute path is
+        in skip_paths are left out.
+        """
+        follow_symlinks = self.config["follow_symlinks"]
+        newline, indent_unit = ('\n', '  ') if pretty else ('', '')
+
+        def list_dir(executor: ThreadPoolExecutor, future: Future, rel_dir: str, with_content: bool,
+                     ancestors: FrozenSet[tuple]) -> list:
+            """
+            Filter a scanned directory, starting scans of its subdirectories on the pool.
+            When following symlinks, ancestors holds the (st_dev, st_ino) of the directories
+            above, and subdirectories among them are not scanned, since a link back into a
+            parent would otherwise recurse forever.
+            """
+            items = []
+            for entry in future.result():
+                # DirEntry serves the type from the directory read, so no stat is needed
+                # unless symlinks are followed
+                if not follow_symlinks and entry.is_symlink():
+                    continue
+                if entry.path in skip_paths:
+                    continue
+                is_dir = entry.is_dir(follow_symlinks=follow_symlinks)
+                if self.should_exclude(entry.name, is_dir, content_only=False):
+                    continue
+
+                include_content = with_content and not self.should_exclude(entry.name, is_dir, content_only=True)
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                subdir = None
+                dir_ancestors = ancestors
+                if is_dir and follow_symlinks:
+                    dir_stat = os.stat(entry.path)
+                    dir_id = (dir_stat.st_dev, dir_stat.st_ino)
+                    if dir_id not in ancestors:
+                        dir_ancestors = ancestors | {dir_id}
+                        subdir = executor.submit(_scan_dir, entry.path)
+                elif is_dir:
+                    subdir = executor.submit(_scan_dir, entry.path)
+                items.append((entry, rel_path, is_dir, subdir, include_content, dir_ancestors))
+            return items
+
+        # Directories are scanned ahead on worker threads, while entries are filtered and
+        # written here in depth-first order. Relative paths are always '/'-separated.
+        with ThreadPoolExecutor(max_workers=_MAX_SCAN_WORKERS) as executor:
+            root_ancestors = frozenset()
+            if follow_symlinks:
+                root_stat = os.stat(folder_path)
+                root_ancestors = frozenset({(root_stat.st_dev, root_stat.st_ino)})
+            items = list_dir(executor, executor.submit(_scan_dir, folder_path), '', True, root_ancestors)
+            if not items:
+                yield f'{indent_unit}<structure/>{newline}'
+                return
+
+            yield f'{indent_unit}<structure>{newline}'
+            stack = [(iter(items), 2)]
+            while stack:
+                items, depth = stack[-1]
+                indent = indent_unit * depth
+                for entry, rel_path, is_dir, subdir, include_content, dir_ancestors in items:
+                    name = _escape_name(entry.name)
+                    if is_dir:
+                        # A symlink back into a parent directory is listed but not walked
+                        children = (list_dir(executor, subdir, rel_path, include_content, dir_ancestors)
+                                    if subdir else [])
+                        if children:
+                            yield f'{indent}<dir name="{name}">{newline}'
+                            stack.append((iter(children), depth + 1))
+                            break
+                        yield f'{indent}<dir name="{name}"/>{newline}'
+                    else:
+                        path = _escape_attr(rel_path)
+                        yield f'{indent}<file name="{name}" path="{path}"/>{newline}'
+                        if include_content and entry.is_file(follow_symlinks=follow_symlinks):
+                            content_files.append((name, path, entry.path))
+                else:
+                    stack.pop()
+                    if stack:
+                        yield f'{indent_unit * (depth - 1)}</dir>{newline}'
+            yield f'{indent_unit}</structure>{newline}'
+
+    def _generate_content(self, full_path: str) -> Iterator[str]:
+        """
+        Stream the contents of a file, escaped for use inside a CDATA section.
+        Bytes that are not valid UTF-8 are replaced.
+        """
+        raw_chunks = _read_chunks(full_path)
+        # Translate CRLF and CR line endings to LF, as the text-mode read used to
+        decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(errors='replace'),
+                                               translate=True)
+        found_terminator = False
+        read_error = None
+        tail = b''
+        try:
+            for raw in raw_chunks:
+                # Split the terminator across two adjacent CDATA sections. ']' is ASCII,
+                # so this is safe on undecoded UTF-8 and cheaper than on str.
+                chunk = (tail + raw).replace(b']]>', b']]]]><![CDATA[>')
+                found_terminator = found_terminator or len(chunk) != len(tail) + len(raw)
+                # Hold back trailing brackets that may start a ']]>' in the next chunk
+                tail_length = 2 if chunk.endswith(b']]') else 1 if chunk.endswith(b']') else 0
+                tail = chunk[len(chunk) - tail_length:]
+                yield decoder.decode(chunk[:len(chunk) - tail_length])
+        except Exception as e:
+            # Keep what was read so far and mark the failure, instead of aborting the document
+            read_error = e
+        finally:
+            raw_chunks.close()
+        yield decoder.decode(tail, final=True)
+
+        if found_terminator:
+            print(f"Warning: Found ']]>' in file: {full_path}")
+        if read_error is not None:
+            print(f"Error processing file: {full_path}")
+            print(f"Error details: {str(read_error)}")
+            # The message includes the file name, which may itself contain ']]>'
+            yield f"Error reading file: {str(read_error)}".replace(']]>', ']]]]><![CDATA[>')
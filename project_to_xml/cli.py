@@ -1,6 +1,6 @@
 import argparse
 
-from project_to_xml.analyzer import ProjectAnalyzer  # Updated import
+from project_to_xml.analyzer import ProjectAnalyzer
 
 
 def main():
@@ -9,12 +9,13 @@ def main():
                         help='Path to the project directory (default: current directory)')
     parser.add_argument('-o', '--output', help='Output file path')
     parser.add_argument('-c', '--config', help='Path to configuration file')
+    parser.add_argument('--pretty', action='store_true', help='Indent the generated XML for readability')
 
     args = parser.parse_args()
 
     try:
         analyzer = ProjectAnalyzer(args.config)
-        output_file = analyzer.create_project_xml(args.path, args.output)
+        output_file = analyzer.create_project_xml(args.path, args.output, pretty=args.pretty)
         print(f"XML file created successfully: {output_file}")
     except Exception as e:
         print(f"Error: {str(e)}")
@@ -8,6 +8,9 @@ setup(
     name="project-to-xml",
     version="0.1.0",
     packages=find_packages(),
+    extras_require={
+        'fast': ['orjson'],
+    },
     entry_points={
         'console_scripts': [
             'project-to-xml=project_to_xml.cli:main',